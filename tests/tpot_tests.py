@@ -29,7 +29,7 @@ from tpot.driver import float_range
 from tpot.gp_types import Output_Array
 from tpot.gp_deap import mutNodeReplacement, _wrapped_cross_val_score, pick_two_individuals_eligible_for_crossover, cxOnePoint, varOr, initialize_stats_dict
 from tpot.metrics import balanced_accuracy, SCORERS
-from tpot.operator_utils import TPOTOperatorClassFactory, set_sample_weight, source_decode
+from tpot.operator_utils import TPOTOperatorClassFactory, ARGTypeClassFactory, set_sample_weight, source_decode
 
 from tpot.config.classifier import classifier_config_dict
 from tpot.config.classifier_light import classifier_config_dict_light
@@ -1951,6 +1951,49 @@ def test_tpot_operator_factory_class():
     assert tpot_argument_list[1].values == [True, False]
 
 
+def test_tpot_operator_factory_class_import_hash():
+    """Assert that the operators class factory files each dependency under its own module in import_hash."""
+    test_config_dict = {
+        'sklearn.feature_selection.SelectFromModel': {
+            'estimator': {
+                'sklearn.ensemble.ExtraTreesClassifier': {
+                    'criterion': ['gini', 'entropy']
+                }
+            },
+            'base_estimator': {
+                'sklearn.ensemble.RandomForestClassifier': {
+                    'n_estimators': [100]
+                }
+            }
+        }
+    }
+
+    op, args = TPOTOperatorClassFactory(
+        'sklearn.feature_selection.SelectFromModel',
+        test_config_dict['sklearn.feature_selection.SelectFromModel']
+    )
+
+    # both dependencies share sklearn.ensemble and must be grouped there,
+    # not appended under the operator's own module
+    assert op.import_hash == {
+        'sklearn.feature_selection': ['SelectFromModel'],
+        'sklearn.ensemble': ['RandomForestClassifier', 'ExtraTreesClassifier']
+    }
+
+
+def test_arg_type_class_factory_type_aware_cache():
+    """Assert that ARGTypeClassFactory does not share classes or values across equal but differently-typed ranges."""
+    bool_type = ARGTypeClassFactory('TypeAwareTest__param', [True, False])
+    int_type = ARGTypeClassFactory('TypeAwareTest__param', [1, 0])
+    float_type = ARGTypeClassFactory('TypeAwareTest__param', [1.0, 0.0])
+
+    assert bool_type is not int_type
+    assert int_type is not float_type
+    assert [type(v) for v in bool_type.values] == [bool, bool]
+    assert [type(v) for v in int_type.values] == [int, int]
+    assert [type(v) for v in float_type.values] == [float, float]
+
+
 def test_PolynomialFeatures_exception():
     """Assert that TPOT allows only one PolynomialFeatures operator in a pipeline."""
 
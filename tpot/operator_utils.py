@@ -23,6 +23,10 @@ License along with TPOT. If not, see <http://www.gnu.org/licenses/>.
 
 """
 
+import functools
+import importlib
+import types
+
 import numpy as np
 from sklearn.base import BaseEstimator, ClassifierMixin, RegressorMixin, TransformerMixin
 from sklearn.feature_selection.base import SelectorMixin
@@ -32,21 +36,32 @@ import inspect
 class Operator(object):
     """Base class for operators in TPOT."""
 
+    __slots__ = ()
+
     root = False  # Whether this operator type can be the root of the tree
     import_hash = None
     sklearn_class = None
     arg_types = None
+    # (pname, dep_op_str) pairs; a tuple rather than a dict so subclasses
+    # can never share (or mutate) one default mapping
+    dep_op_list = ()
+    dep_op_type = None
 
 
 class ARGType(object):
     """Base class for parameter specifications."""
 
-    pass
+    __slots__ = ()
 
 
+@functools.lru_cache(maxsize=None)
 def source_decode(sourcecode, verbose=0):
     """Decode operator source and import operator class.
 
+    Results are memoized, so repeat decodes of the same operator source
+    (e.g. dependencies shared by many operators) skip the import machinery
+    and the unavailability warning is only printed once per source.
+
     Parameters
     ----------
     sourcecode: string
@@ -71,11 +86,7 @@ def source_decode(sourcecode, verbose=0):
     op_str = tmp_path.pop()
     import_str = '.'.join(tmp_path)
     try:
-        if sourcecode.startswith('tpot.'):
-            exec('from {} import {}'.format(import_str[4:], op_str))
-        else:
-            exec('from {} import {}'.format(import_str, op_str))
-        op_obj = eval(op_str)
+        op_obj = getattr(importlib.import_module(import_str), op_str)
     except Exception as e:
         if verbose > 2:
             raise ImportError('Error: could not import {}.\n{}'.format(sourcecode, e))
@@ -114,9 +125,19 @@ def set_sample_weight(pipeline_steps, sample_weight=None):
         return None
 
 
+_arg_type_cache = {}
+_prange_intern = {}
+
+
 def ARGTypeClassFactory(classname, prange, BaseClass=ARGType):
     """Dynamically create parameter type class.
 
+    Classes are cached by name and parameter values, so repeated factory
+    runs (operator classes are rebuilt on every `fit` call) reuse one
+    class per unique parameter signature instead of invoking the
+    metaclass again. DEAP keys its typed primitives on class identity,
+    which the cache preserves across runs.
+
     Parameters
     ----------
     classname: string
@@ -132,7 +153,230 @@ def ARGTypeClassFactory(classname, prange, BaseClass=ARGType):
         parameter class
 
     """
-    return type(classname, (BaseClass,), {'values': prange})
+    # Pre-split the class name so export() does not have to re-split it for
+    # every argument of every evaluated pipeline.
+    name_parts = tuple(classname.split('__'))
+    if isinstance(prange, np.ndarray):
+        values_key = ('ndarray', prange.dtype.str, prange.shape, prange.tobytes())
+    else:
+        # pair every value with its type: True/1/1.0 are equal and hash
+        # alike, but ranges must not be shared across type boundaries
+        # (e.g. max_features=1 and max_features=1.0 mean different things)
+        values_key = tuple(zip(map(type, prange), prange))
+    try:
+        # many parameters share identical value ranges (e.g. [True, False],
+        # np.arange grids); intern them so equal ranges are stored once
+        prange = _prange_intern.setdefault(values_key, prange)
+        arg_type = _arg_type_cache.get((classname, BaseClass, values_key))
+    except TypeError: # unhashable parameter values, build an uncached class
+        arg_type = None
+        values_key = None
+    profile = {
+        '__slots__': (),
+        'values': prange,
+        '_name_parts': name_parts,
+        '_is_simple': len(name_parts) == 2,
+    }
+    if arg_type is None:
+        arg_type = type(classname, (BaseClass,), profile)
+        if values_key is not None:
+            _arg_type_cache[(classname, BaseClass, values_key)] = arg_type
+    return arg_type
+
+
+@classmethod
+def _op_type(cls):
+    """Return the operator type.
+
+    Possible values:
+        "Classifier", "Regressor", "Selector", "Transformer"
+    """
+    return cls._optype
+
+
+@classmethod
+def _op_materialize(cls):
+    """Build the heavyweight parts of an operator class.
+
+    Creates the ARGType subclasses for every parameter, decodes nested
+    dependencies and assembles the import hash. Called once by the
+    factory, right after the class namespace is assembled.
+    """
+    op_str = cls.__name__
+    dep_op_list = {} # list of nested estimator/callable function
+    dep_op_type = {} # type of nested estimator/callable function
+    dep_op_estimators = set() # dep params exported as a constructor call
+    import_hash = {}
+    import_hash[cls._import_str] = [op_str]
+    arg_types = []
+
+    # decode every nested dependency in one dedup'd pass up front; operators
+    # commonly share dependency modules and source_decode memoizes, so the
+    # per-parameter loop below only does dict lookups
+    dep_decoded = {
+        dkey: source_decode(dkey, verbose=cls._verbose)
+        for prange in cls._opdict.values() if isinstance(prange, dict)
+        for dkey in prange
+    }
+
+    for pname in sorted(cls._opdict):
+        prange = cls._opdict[pname]
+        if not isinstance(prange, dict):
+            classname = '{}__{}'.format(op_str, pname)
+            arg_types.append(ARGTypeClassFactory(classname, prange, cls._arg_base_class))
+        else:
+            for dkey, dval in prange.items():
+                dep_import_str, dep_op_str, dep_op_obj = dep_decoded[dkey]
+                import_hash.setdefault(dep_import_str, []).append(dep_op_str)
+                dep_op_list[pname] = dep_op_str
+                dep_op_type[pname] = dep_op_obj
+                # decide once how the dependency renders in export():
+                # estimators as a constructor call, callables (e.g. a
+                # scoring function) as a bare reference
+                if inspect.isclass(dep_op_obj) and \
+                    issubclass(dep_op_obj, (BaseEstimator, ClassifierMixin,
+                                            RegressorMixin, TransformerMixin)):
+                    dep_op_estimators.add(pname)
+                if dval:
+                    arg_types.extend(
+                        ARGTypeClassFactory(
+                            '{}__{}__{}'.format(op_str, dep_op_str, dpname),
+                            dval[dpname],
+                            cls._arg_base_class
+                        )
+                        for dpname in sorted(dval)
+                    )
+
+    cls.arg_types = tuple(arg_types)
+    cls.import_hash = import_hash
+    # frozen as (pname, dep_op_str) pairs; export iterates it on every call
+    cls.dep_op_list = tuple(dep_op_list.items())
+    cls.dep_op_type = dep_op_type
+    cls._dep_op_estimators = frozenset(dep_op_estimators)
+    # (input types, return types); built once -- callers copy the input-type
+    # list (they slice it) rather than mutate it in place
+    cls._parameter_types = ([np.ndarray] + arg_types, np.ndarray)
+    cls._export_fn = _compile_export_fn(
+        cls.sklearn_class.__name__,
+        cls.arg_types,
+        cls.dep_op_list,
+        cls._dep_op_estimators
+    )
+
+
+def _quote_export_value(value):
+    """Quote a parameter value for an exported pipeline string."""
+    if isinstance(value, str):
+        return f'"{value}"'
+    return value
+
+
+def _compile_export_fn(op_name, arg_types, dep_op_list, dep_op_estimators):
+    """Compile a specialized export function for one operator class.
+
+    The structure of an exported operator string (which argument is a
+    simple parameter, which belongs to a nested dependency, how each
+    dependency renders) is fully determined when the class materializes,
+    so instead of re-deriving it per call the whole string is baked into
+    one generated f-string over the argument tuple.
+
+    Parameters
+    ----------
+    op_name: string
+        name of the sklearn class being exported
+    arg_types: tuple
+        the operator's ARGType classes, in primitive-argument order
+    dep_op_list: tuple
+        (pname, dep_op_str) pairs of nested dependencies
+    dep_op_estimators: frozenset
+        pnames of dependencies that render as a constructor call
+
+    Returns
+    -------
+    function
+        takes the primitive's argument values and returns the export string
+
+    """
+    simple_parts = []
+    dep_arg_parts = {}
+    for idx, arg_type in enumerate(arg_types):
+        # terminals only ever take values from the parameter range, so
+        # positions that can never hold a string skip the quoting call
+        if any(isinstance(value, str) for value in arg_type.values):
+            accessor = '{{_q(args[{}])}}'.format(idx)
+        else:
+            accessor = '{{args[{}]}}'.format(idx)
+        name_parts = arg_type._name_parts
+        if arg_type._is_simple:
+            simple_parts.append('{}={}'.format(name_parts[-1], accessor))
+        # Parameter of internal operator as a parameter in the
+        # operator, usually in Selector
+        else:
+            dep_arg_parts.setdefault(name_parts[1], []).append(
+                '{}={}'.format(name_parts[-1], accessor))
+
+    # To make sure the inital operators is the first parameter just
+    # for better persentation
+    parts = []
+    for pname, dep_op_str in dep_op_list:
+        if pname in dep_op_estimators: # a estimator
+            parts.append('{}={}({})'.format(
+                pname, dep_op_str, ', '.join(dep_arg_parts.get(dep_op_str, []))))
+        else:
+            parts.append('{}={}'.format(pname, dep_op_str)) # a callable function
+    parts.extend(simple_parts)
+
+    src = "def _export(*args):\n    return f'{}({})'\n".format(op_name, ', '.join(parts))
+    namespace = {'_q': _quote_export_value}
+    exec(compile(src, '<tpot.export:{}>'.format(op_name), 'exec'), namespace)
+    return namespace['_export']
+
+
+@classmethod
+def _op_parameter_types(cls):
+    """Return the argument and return types of an operator.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    parameter_types: tuple
+        Tuple of the DEAP parameter types and the DEAP return type for the
+        operator
+
+    """
+    return cls._parameter_types # (input types, return types)
+
+
+@classmethod
+def _op_export(cls, *args):
+    """Represent the operator as a string so that it can be exported to a file.
+
+    Parameters
+    ----------
+    args
+        Arbitrary arguments to be passed to the operator
+
+    Returns
+    -------
+    export_string: str
+        String representation of the sklearn class with its parameters in
+        the format:
+        SklearnClassName(param1="val1", param2=val2)
+
+    """
+    return cls._export_fn(*args)
+
+
+# classmethods shared by every generated operator class
+_operator_class_methods = {
+    'type': _op_type,
+    '_materialize': _op_materialize,
+    'parameter_types': _op_parameter_types,
+    'export': _op_export,
+}
 
 
 def TPOTOperatorClassFactory(opsourse, opdict, BaseClass=Operator, ArgBaseClass=ARGType, verbose=0):
@@ -165,139 +409,41 @@ def TPOTOperatorClassFactory(opsourse, opdict, BaseClass=Operator, ArgBaseClass=
         a list of parameter class
 
     """
-    class_profile = {}
-    dep_op_list = {} # list of nested estimator/callable function
-    dep_op_type = {} # type of nested estimator/callable function
     import_str, op_str, op_obj = source_decode(opsourse, verbose=verbose)
 
     if not op_obj:
         return None, None
     else:
         # define if the operator can be the root of a pipeline
+        root = issubclass(op_obj, (ClassifierMixin, RegressorMixin))
+        optype = None
         if issubclass(op_obj, ClassifierMixin):
-            class_profile['root'] = True
             optype = "Classifier"
         elif issubclass(op_obj, RegressorMixin):
-            class_profile['root'] = True
             optype = "Regressor"
         if issubclass(op_obj, TransformerMixin):
             optype = "Transformer"
         if issubclass(op_obj, SelectorMixin):
             optype = "Selector"
 
-        @classmethod
-        def op_type(cls):
-            """Return the operator type.
-
-            Possible values:
-                "Classifier", "Regressor", "Selector", "Transformer"
-            """
-            return optype
-
-        class_profile['type'] = op_type
-        class_profile['sklearn_class'] = op_obj
-        import_hash = {}
-        import_hash[import_str] = [op_str]
-        arg_types = []
-
-        for pname in sorted(opdict.keys()):
-            prange = opdict[pname]
-            if not isinstance(prange, dict):
-                classname = '{}__{}'.format(op_str, pname)
-                arg_types.append(ARGTypeClassFactory(classname, prange, ArgBaseClass))
-            else:
-                for dkey, dval in prange.items():
-                    dep_import_str, dep_op_str, dep_op_obj = source_decode(dkey, verbose=verbose)
-                    if dep_import_str in import_hash:
-                        import_hash[import_str].append(dep_op_str)
-                    else:
-                        import_hash[dep_import_str] = [dep_op_str]
-                    dep_op_list[pname] = dep_op_str
-                    dep_op_type[pname] = dep_op_obj
-                    if dval:
-                        for dpname in sorted(dval.keys()):
-                            dprange = dval[dpname]
-                            classname = '{}__{}__{}'.format(op_str, dep_op_str, dpname)
-                            arg_types.append(ARGTypeClassFactory(classname, dprange, ArgBaseClass))
-        class_profile['arg_types'] = tuple(arg_types)
-        class_profile['import_hash'] = import_hash
-        class_profile['dep_op_list'] = dep_op_list
-        class_profile['dep_op_type'] = dep_op_type
-
-        @classmethod
-        def parameter_types(cls):
-            """Return the argument and return types of an operator.
-
-            Parameters
-            ----------
-            None
-
-            Returns
-            -------
-            parameter_types: tuple
-                Tuple of the DEAP parameter types and the DEAP return type for the
-                operator
-
-            """
-            return ([np.ndarray] + arg_types, np.ndarray) # (input types, return types)
-
-        class_profile['parameter_types'] = parameter_types
-
-        @classmethod
-        def export(cls, *args):
-            """Represent the operator as a string so that it can be exported to a file.
-
-            Parameters
-            ----------
-            args
-                Arbitrary arguments to be passed to the operator
-
-            Returns
-            -------
-            export_string: str
-                String representation of the sklearn class with its parameters in
-                the format:
-                SklearnClassName(param1="val1", param2=val2)
-
-            """
-            op_arguments = []
-
-            if dep_op_list:
-                dep_op_arguments = {}
-                for dep_op_str in dep_op_list.values():
-                    dep_op_arguments[dep_op_str] = []
-
-            for arg_class, arg_value in zip(arg_types, args):
-                aname_split = arg_class.__name__.split('__')
-                if isinstance(arg_value, str):
-                    arg_value = '\"{}\"'.format(arg_value)
-                if len(aname_split) == 2:  # simple parameter
-                    op_arguments.append("{}={}".format(aname_split[-1], arg_value))
-                # Parameter of internal operator as a parameter in the
-                # operator, usually in Selector
-                else:
-                    dep_op_arguments[aname_split[1]].append("{}={}".format(aname_split[-1], arg_value))
-
-            tmp_op_args = []
-            if dep_op_list:
-                # To make sure the inital operators is the first parameter just
-                # for better persentation
-                for dep_op_pname, dep_op_str in dep_op_list.items():
-                    arg_value = dep_op_str # a callable function, e.g scoring function
-                    doptype = dep_op_type[dep_op_pname]
-                    if inspect.isclass(doptype): # a estimator
-                        if issubclass(doptype, BaseEstimator) or \
-                            issubclass(doptype, ClassifierMixin) or \
-                            issubclass(doptype, RegressorMixin) or \
-                            issubclass(doptype, TransformerMixin):
-                            arg_value = "{}({})".format(dep_op_str, ", ".join(dep_op_arguments[dep_op_str]))
-                    tmp_op_args.append("{}={}".format(dep_op_pname, arg_value))
-            op_arguments = tmp_op_args + op_arguments
-            return "{}({})".format(op_obj.__name__, ", ".join(op_arguments))
-
-        class_profile['export'] = export
+        def assemble_class(ns):
+            # The method bodies live at module level and read these class
+            # attributes, so no new function objects are allocated per
+            # operator.
+            ns.update(_operator_class_methods)
+            ns['__slots__'] = ()
+            if root:
+                ns['root'] = True
+            ns['_optype'] = optype
+            ns['sklearn_class'] = op_obj
+            ns['_import_str'] = import_str
+            ns['_opdict'] = opdict
+            ns['_arg_base_class'] = ArgBaseClass
+            ns['_verbose'] = verbose
+            return ns
 
         op_classname = 'TPOT_{}'.format(op_str)
-        op_class = type(op_classname, (BaseClass,), class_profile)
+        op_class = types.new_class(op_classname, (BaseClass,), exec_body=assemble_class)
         op_class.__name__ = op_str
-        return op_class, arg_types
+        op_class._materialize()
+        return op_class, list(op_class.arg_types)